@@ -1,267 +1,513 @@
-from __future__ import annotations
-
-from fastapi import FastAPI, Depends, HTTPException, Header
-from pydantic import BaseModel, Field
-from typing import Optional, Protocol
-from base64 import b64decode, b64encode
-from datetime import datetime, timezone
-from pathlib import Path as SysPath
-import hashlib, os, re, requests
-
-API_TOKENS = {"hello1234"}  # this is the token needed in every transaction with the API
-
-# Local filesystem backend dir
-LOCAL_STORAGE_DIR = SysPath("./storage")
-
-
-DATABASE_URL = "sqlite:///./app.db"
-
-
-S3_BUCKET   = "expiriment"                 
-S3_REGION   = "eu-north-1"                 
-S3_ENDPOINT = f"https://s3.eu-north-1.amazonaws.com"
-
-
-
-
-#Authrization 
-def require_bearer(authorization: Optional[str] = Header(None)) -> None:
-    if not authorization or not authorization.lower().startswith("bearer "):
-        raise HTTPException(status_code=401, detail="Missing/invalid Authorization header")
-    token = authorization.split(" ", 1)[1]
-    if token not in API_TOKENS:
-        raise HTTPException(status_code=403, detail="Invalid token")
-
-#Classes
-class BlobIn(BaseModel):
-    id: str = Field(..., description="Unique identifier for the blob (string/path ok)")
-    data: str = Field(..., description="Base64-encoded bytes")
-
-class BlobOut(BaseModel):
-    id: str
-    data: str
-    size: int
-    created_at: str
-
-#db setup
-from sqlalchemy import (
-    create_engine, Column, String, Integer, DateTime, LargeBinary, UniqueConstraint
-)
-from sqlalchemy.orm import sessionmaker, declarative_base, Session
-
-engine = create_engine(
-    DATABASE_URL,
-    connect_args={"check_same_thread": False} if DATABASE_URL.startswith("sqlite") else {},
-)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-Base = declarative_base()
-
-class BlobMeta(Base):
-    __tablename__ = "blob_meta"
-    id = Column(String, primary_key=True)
-    backend = Column(String, nullable=False)             # "local" OR "db" OR "s3"
-    locator = Column(String, nullable=False)             # where in backend
-    size = Column(Integer, nullable=False)
-    created_at = Column(DateTime(timezone=True), nullable=False)
-    __table_args__ = (UniqueConstraint("backend", "id", name="uq_backend_id"),)
-
-class BlobData(Base):
-    __tablename__ = "blob_data"  # used only by DB backend to store bytes
-    id = Column(String, primary_key=True)
-    data = Column(LargeBinary, nullable=False)
-
-Base.metadata.create_all(engine)
-
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-# ---------- Helpers ----------
-SAFE_SEG = re.compile(r"^[A-Za-z0-9._-]+$")
-def safe_relpath(key: str) -> SysPath:
-    parts = []
-    for seg in key.strip("/").split("/"):
-        seg = seg.strip()
-        if not seg or seg == "." or seg == "..":
-            continue
-        parts.append(seg if SAFE_SEG.match(seg) else hashlib.sha256(seg.encode()).hexdigest()[:16])
-    return SysPath(*parts) if parts else SysPath("blob")
-
-def utc_now_iso() -> str:
-    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
-
-# Storage Protocol 
-class Storage(Protocol):
-    def put(self, key: str, data: bytes) -> str: ...
-    def get(self, locator: str) -> bytes: ...
-
-# Local FS 
-class LocalFS(Storage):
-    def __init__(self, base: SysPath):
-        self.base = base
-        self.base.mkdir(parents=True, exist_ok=True)
-    def put(self, key: str, data: bytes) -> str:
-        rel = safe_relpath(key)
-        path = self.base / rel
-        path.parent.mkdir(parents=True, exist_ok=True)
-        tmp = path.with_suffix(path.suffix + ".part")
-        with open(tmp, "wb") as f:
-            f.write(data)
-        os.replace(tmp, path)  # atomic
-        return str(rel).replace("\\", "/")
-    def get(self, locator: str) -> bytes:
-        rel = safe_relpath(locator)
-        path = self.base / rel
-        if not path.exists():
-            raise FileNotFoundError(locator)
-        return path.read_bytes()
-
-LOCAL = LocalFS(LOCAL_STORAGE_DIR)
-
-# Database
-class DBTable(Storage):
-    def __init__(self, db_factory):
-        self.db_factory = db_factory
-    def put(self, key: str, data: bytes) -> str:
-        with self.db_factory() as db:
-            row = db.get(BlobData, key)
-            if row:
-                db.delete(row); db.flush()
-            db.add(BlobData(id=key, data=data))
-            db.commit()
-        return key
-    def get(self, locator: str) -> bytes:
-        with self.db_factory() as db:
-            row = db.get(BlobData, locator)
-            if not row:
-                raise FileNotFoundError(locator)
-            return bytes(row.data)
-
-DBBACK = DBTable(SessionLocal)
-
-# S3
-class S3(Storage):
-    def __init__(self, endpoint: str, region: str, bucket: str):
-        self.endpoint = endpoint.rstrip("/")
-        self.region = region
-        self.bucket = bucket
-        self.session = requests.Session()
-
-    def _url(self, object_key: str) -> str:
-        host = f"{self.bucket}.s3.{self.region}.amazonaws.com"
-        return f"https://{host}/{object_key}"
-
-    def put(self, key: str, data: bytes) -> str:
-        object_key = "/".join(safe_relpath(key).parts)
-        url = self._url(object_key)
-        r = self.session.put(url, data=data)  
-        if r.status_code not in (200, 201):
-            raise RuntimeError(f"S3 PUT failed: {r.status_code} {r.text}")
-        return object_key
-
-    def get(self, locator: str) -> bytes:
-        object_key = "/".join(safe_relpath(locator).parts)
-        url = self._url(object_key)
-        r = self.session.get(url)  
-        if r.status_code != 200:
-            raise FileNotFoundError(f"S3 GET failed: {r.status_code} {r.text}")
-        return r.content
-
-S3BACK = S3(S3_ENDPOINT, S3_REGION, S3_BUCKET)
-
-# FastAPI 
-app = FastAPI(title="Simple Blob Store (local, db, s3 unsigned)")
-
-# Local
-@app.post("/v1/local/blobs", response_model=BlobOut)
-def store_local(body: BlobIn, _=Depends(require_bearer), db: Session = Depends(get_db)):
-    try:
-        raw = b64decode(body.data, validate=True)
-    except Exception:
-        raise HTTPException(status_code=400, detail="Invalid Base64 'data'")
-    exists = db.query(BlobMeta).filter_by(backend="local", id=body.id).one_or_none()
-    if exists:
-        raise HTTPException(status_code=409, detail="id already exists for this backend")
-    try:
-        locator = LOCAL.put(body.id, raw)
-    except Exception as e:
-        raise HTTPException(status_code=502, detail=f"Backend error: {e}")
-    meta = BlobMeta(id=body.id, backend="local", locator=locator, size=len(raw), created_at=datetime.now(timezone.utc))
-    db.add(meta); db.commit()
-    return BlobOut(id=body.id, data=body.data, size=len(raw), created_at=meta.created_at.strftime("%Y-%m-%dT%H:%M:%SZ"))
-
-@app.get("/v1/local/blobs/{id:path}", response_model=BlobOut)
-def get_local(id: str, _=Depends(require_bearer), db: Session = Depends(get_db)):
-    meta = db.query(BlobMeta).filter_by(backend="local", id=id).one_or_none()
-    if not meta:
-        raise HTTPException(status_code=404, detail="Unknown id")
-    try:
-        raw = LOCAL.get(meta.locator)
-    except FileNotFoundError:
-        raise HTTPException(status_code=502, detail="Object missing in backend")
-    return BlobOut(id=id, data=b64encode(raw).decode(), size=meta.size, created_at=meta.created_at.strftime("%Y-%m-%dT%H:%M:%SZ"))
-
-# DB
-@app.post("/v1/db/blobs", response_model=BlobOut)
-def store_db(body: BlobIn, _=Depends(require_bearer), db: Session = Depends(get_db)):
-    try:
-        raw = b64decode(body.data, validate=True)
-    except Exception:
-        raise HTTPException(status_code=400, detail="Invalid Base64 'data'")
-    exists = db.query(BlobMeta).filter_by(backend="db", id=body.id).one_or_none()
-    if exists:
-        raise HTTPException(status_code=409, detail="id already exists for this backend")
-    try:
-        locator = DBBACK.put(body.id, raw)
-    except Exception as e:
-        raise HTTPException(status_code=502, detail=f"Backend error: {e}")
-    meta = BlobMeta(id=body.id, backend="db", locator=locator, size=len(raw), created_at=datetime.now(timezone.utc))
-    db.add(meta); db.commit()
-    return BlobOut(id=body.id, data=body.data, size=len(raw), created_at=meta.created_at.strftime("%Y-%m-%dT%H:%M:%SZ"))
-
-@app.get("/v1/db/blobs/{id:path}", response_model=BlobOut)
-def get_db_blob(id: str, _=Depends(require_bearer), db: Session = Depends(get_db)):
-    meta = db.query(BlobMeta).filter_by(backend="db", id=id).one_or_none()
-    if not meta:
-        raise HTTPException(status_code=404, detail="Unknown id")
-    try:
-        raw = DBBACK.get(meta.locator)
-    except FileNotFoundError:
-        raise HTTPException(status_code=502, detail="Object missing in backend")
-    return BlobOut(id=id, data=b64encode(raw).decode(), size=meta.size, created_at=meta.created_at.strftime("%Y-%m-%dT%H:%M:%SZ"))
-
-# S3
-@app.post("/v1/s3/blobs", response_model=BlobOut)
-def store_s3(body: BlobIn, _=Depends(require_bearer), db: Session = Depends(get_db)):
-    try:
-        raw = b64decode(body.data, validate=True)
-    except Exception:
-        raise HTTPException(status_code=400, detail="Invalid Base64 'data'")
-    exists = db.query(BlobMeta).filter_by(backend="s3", id=body.id).one_or_none()
-    if exists:
-        raise HTTPException(status_code=409, detail="id already exists for this backend")
-    try:
-        locator = S3BACK.put(body.id, raw)  
-    except Exception as e:
-        raise HTTPException(status_code=502, detail=f"S3 error: {e}")
-    meta = BlobMeta(id=body.id, backend="s3", locator=locator, size=len(raw), created_at=datetime.now(timezone.utc))
-    db.add(meta); db.commit()
-    return BlobOut(id=body.id, data=body.data, size=len(raw), created_at=meta.created_at.strftime("%Y-%m-%dT%H:%M:%SZ"))
-
-@app.get("/v1/s3/blobs/{id:path}", response_model=BlobOut)
-def get_s3_blob(id: str, _=Depends(require_bearer), db: Session = Depends(get_db)):
-    meta = db.query(BlobMeta).filter_by(backend="s3", id=id).one_or_none()
-    if not meta:
-        raise HTTPException(status_code=404, detail="Unknown id")
-    try:
-        raw = S3BACK.get(meta.locator) 
-    except FileNotFoundError:
-        raise HTTPException(status_code=502, detail="Object missing in backend")
-    return BlobOut(id=id, data=b64encode(raw).decode(), size=meta.size, created_at=meta.created_at.strftime("%Y-%m-%dT%H:%M:%SZ"))
-
-@app.get("/health")
-def health():
-    return {"ok": True, "backends": ["local", "db", "s3_unsigned"], "bucket": S3_BUCKET}
\ No newline at end of file
+from __future__ import annotations
+
+from fastapi import FastAPI, Depends, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse, ORJSONResponse, Response
+from pydantic import BaseModel, Field
+from typing import NamedTuple, Optional, Protocol
+from cachetools import LRUCache
+try:
+    from pybase64 import b64decode, b64encode_as_string  # SIMD codec
+except ImportError:
+    from base64 import b64decode, b64encode
+    def b64encode_as_string(data) -> str:
+        return b64encode(data).decode("ascii")
+from pathlib import Path as SysPath
+import functools, hashlib, os, queue, re, threading, time, aiohttp, orjson, xxhash
+
+API_TOKENS = {"hello1234"}  # this is the token needed in every transaction with the API
+API_TOKENS_BYTES = {t.encode() for t in API_TOKENS}
+
+# Local filesystem backend dir
+LOCAL_STORAGE_DIR = SysPath("./storage")
+
+
+DATABASE_URL = "sqlite:///./app.db"
+GROUP_COMMIT = False                        # batch metadata inserts in a background flusher (SQLite only)
+GROUP_COMMIT_MAX = 256                      # rows per batch
+GROUP_COMMIT_WINDOW = 0.005                 # seconds a batch waits to fill up
+META_CACHE_SIZE = 100_000                   # metadata rows kept in memory
+BLOB_CACHE_BYTES = 256 * 1024 * 1024        # budget for cached base64 payloads (local/db)
+BLOB_CACHE_ITEM_LIMIT = 1 << 20             # larger payloads are never cached
+HEALTH_TTL = 1.0                            # seconds a serialized /health body is reused
+
+
+S3_BUCKET   = "expiriment"                 
+S3_REGION   = "eu-north-1"                 
+S3_ENDPOINT = f"https://s3.eu-north-1.amazonaws.com"
+S3_CHUNK_SIZE = 1 << 20                     # bytes per read when streaming GETs
+
+
+
+
+#Authrization 
+class BearerAuth:
+    # plain ASGI middleware guarding /v1/: checks the raw header bytes before routing
+    def __init__(self, app):
+        self.app = app
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"].startswith("/v1/"):
+            auth = next((v for k, v in scope["headers"] if k == b"authorization"), None)
+            if not auth or auth[:7].lower() != b"bearer ":
+                resp = ORJSONResponse({"detail": "Missing/invalid Authorization header"}, status_code=401)
+                return await resp(scope, receive, send)
+            if auth[7:] not in API_TOKENS_BYTES:
+                return await ORJSONResponse({"detail": "Invalid token"}, status_code=403)(scope, receive, send)
+        await self.app(scope, receive, send)
+
+#Classes
+class BlobIn(BaseModel):
+    id: str = Field(..., description="Unique identifier for the blob (string/path ok)")
+    data: str = Field(..., description="Base64-encoded bytes")
+
+class BlobOut(BaseModel):
+    id: str
+    data: str
+    size: int
+    created_at: str
+
+#db setup
+from sqlalchemy import (
+    create_engine, event, lambda_stmt, select, insert, delete, bindparam, Column, String, Integer, LargeBinary
+)
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import sessionmaker, declarative_base, Session
+from sqlalchemy.pool import QueuePool
+
+# sized for concurrent requests; the default pool (5 + 10 overflow) times out under load
+engine = create_engine(
+    DATABASE_URL,
+    poolclass=QueuePool,
+    pool_size=20,
+    max_overflow=40,
+    pool_recycle=3600,
+    connect_args={"check_same_thread": False} if DATABASE_URL.startswith("sqlite") else {},
+)
+
+if DATABASE_URL.startswith("sqlite"):
+    @event.listens_for(engine, "connect")
+    def sqlite_pragmas(dbapi_conn, _):
+        # WAL lets readers run alongside the writer; NORMAL skips the fsync per commit
+        cur = dbapi_conn.cursor()
+        cur.execute("PRAGMA journal_mode=WAL")
+        cur.execute("PRAGMA synchronous=NORMAL")
+        cur.execute("PRAGMA mmap_size=268435456")   # 256 MiB of the file read via mmap
+        cur.execute("PRAGMA cache_size=-65536")     # 64 MiB page cache per connection
+        cur.close()
+
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
+Base = declarative_base()
+
+class BlobMeta(Base):
+    __tablename__ = "blob_meta"
+    id = Column(String, primary_key=True)
+    backend = Column(String, primary_key=True)           # "local" OR "db" OR "s3"
+    locator = Column(String, nullable=False)             # where in backend
+    size = Column(Integer, nullable=False)
+    created_at = Column(Integer, nullable=False)         # unix epoch seconds, UTC
+
+class BlobContent(Base):
+    __tablename__ = "blob_content"  # used only by DB backend; one row per distinct payload
+    hash = Column(String, primary_key=True)              # sha256 hex of data
+    data = Column(LargeBinary, nullable=False)
+
+class BlobSummary(Base):
+    __tablename__ = "blob_summary"  # per-backend roll-up, kept current by triggers on blob_meta
+    backend = Column(String, primary_key=True)
+    count = Column(Integer, nullable=False)
+    total_bytes = Column(Integer, nullable=False)
+
+Base.metadata.create_all(engine)
+
+SUMMARY_TRIGGERS = (
+    """CREATE TRIGGER IF NOT EXISTS blob_meta_ins AFTER INSERT ON blob_meta BEGIN
+        INSERT INTO blob_summary (backend, count, total_bytes) VALUES (NEW.backend, 1, NEW.size)
+        ON CONFLICT (backend) DO UPDATE SET count = count + 1, total_bytes = total_bytes + NEW.size;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS blob_meta_del AFTER DELETE ON blob_meta BEGIN
+        UPDATE blob_summary SET count = count - 1, total_bytes = total_bytes - OLD.size
+        WHERE backend = OLD.backend;
+    END""",
+)
+if DATABASE_URL.startswith("sqlite"):
+    with engine.begin() as conn:
+        for ddl in SUMMARY_TRIGGERS:
+            conn.exec_driver_sql(ddl)
+        # first run against an existing database: seed the roll-up from what is already stored
+        if conn.exec_driver_sql("SELECT COUNT(*) FROM blob_summary").scalar() == 0:
+            conn.exec_driver_sql(
+                "INSERT INTO blob_summary (backend, count, total_bytes) "
+                "SELECT backend, COUNT(*), SUM(size) FROM blob_meta GROUP BY backend"
+            )
+
+# built once; SQLAlchemy caches the compiled SQL and only rebinds the params per call
+META_LOOKUP = lambda_stmt(
+    lambda: select(BlobMeta).where(BlobMeta.backend == bindparam("backend"), BlobMeta.id == bindparam("id"))
+)
+
+def get_db():
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+# write-through cache of metadata rows keyed by (backend, id)
+class MetaRow(NamedTuple):
+    locator: str
+    size: int
+    created_at: int
+
+meta_cache: LRUCache = LRUCache(maxsize=META_CACHE_SIZE)
+meta_cache_lock = threading.Lock()
+
+def find_meta(db: Session, backend: str, id: str) -> Optional[MetaRow]:
+    key = (backend, id)
+    with meta_cache_lock:
+        row = meta_cache.get(key)
+    if row is None:
+        meta = db.execute(META_LOOKUP, {"backend": backend, "id": id}).scalar_one_or_none()
+        if meta is None:
+            return None
+        row = MetaRow(meta.locator, meta.size, meta.created_at)
+        with meta_cache_lock:
+            meta_cache[key] = row
+    return row
+
+# metadata writes go through Core statements: no identity map or unit-of-work per insert
+def meta_values(meta: BlobMeta) -> dict:
+    return {"id": meta.id, "backend": meta.backend, "locator": meta.locator, "size": meta.size, "created_at": meta.created_at}
+
+# Group commit: request threads queue their row and wait; one thread commits many rows per transaction
+class PendingMeta:
+    def __init__(self, meta: BlobMeta):
+        self.meta = meta
+        self.done = threading.Event()
+        self.error: Optional[Exception] = None
+
+group_commit = GROUP_COMMIT and DATABASE_URL.startswith("sqlite")  # needs WAL to pay off
+meta_queue: "queue.Queue[PendingMeta]" = queue.Queue()
+
+def commit_batch(batch: list[PendingMeta]) -> None:
+    try:
+        with SessionLocal() as db:
+            db.execute(insert(BlobMeta), [meta_values(p.meta) for p in batch]); db.commit()
+    except Exception:
+        # one bad row (usually a taken id) fails the whole transaction: retry the rows one by one
+        for p in batch:
+            try:
+                with SessionLocal() as db:
+                    db.execute(insert(BlobMeta).values(meta_values(p.meta))); db.commit()
+            except Exception as e:
+                p.error = e
+    for p in batch:
+        p.done.set()
+
+def flush_meta_forever() -> None:
+    while True:
+        batch = [meta_queue.get()]
+        deadline = time.monotonic() + GROUP_COMMIT_WINDOW
+        while len(batch) < GROUP_COMMIT_MAX:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(meta_queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        commit_batch(batch)
+
+if group_commit:
+    threading.Thread(target=flush_meta_forever, name="meta-flusher", daemon=True).start()
+
+def commit_grouped(meta: BlobMeta) -> None:
+    pending = PendingMeta(meta)
+    meta_queue.put(pending)
+    pending.done.wait()
+    if pending.error is not None:
+        raise pending.error
+
+def reserve_meta(db: Session, meta: BlobMeta) -> None:
+    # the insert is the duplicate check: the key constraint rejects a taken id
+    try:
+        if group_commit:
+            commit_grouped(meta)
+        else:
+            db.execute(insert(BlobMeta).values(meta_values(meta))); db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(status_code=409, detail="id already exists for this backend")
+    with meta_cache_lock:
+        meta_cache[(meta.backend, meta.id)] = MetaRow(meta.locator, meta.size, meta.created_at)
+
+def release_meta(db: Session, meta: BlobMeta) -> None:
+    db.execute(delete(BlobMeta).where(BlobMeta.backend == meta.backend, BlobMeta.id == meta.id)); db.commit()
+    with meta_cache_lock:
+        meta_cache.pop((meta.backend, meta.id), None)
+
+# ---------- Helpers ----------
+SAFE_SEG = re.compile(r"^[A-Za-z0-9._-]+$")
+@functools.lru_cache(maxsize=65536)  # ids repeat across PUT/GET; the result is immutable
+def safe_relpath(key: str) -> SysPath:
+    parts = []
+    is_safe = SAFE_SEG.match
+    for seg in key.strip("/").split("/"):
+        seg = seg.strip()
+        if not seg or seg == "." or seg == "..":
+            continue
+        # non-cryptographic: the hash only maps an unsafe segment to a stable file name
+        parts.append(seg if is_safe(seg) else xxhash.xxh3_64_hexdigest(seg.encode()))
+    return SysPath(*parts) if parts else SysPath("blob")
+
+# most requests in a given second share its timestamp, so keep the last formatted one
+last_iso: tuple[int, str] = (-1, "")
+def epoch_iso(epoch: int) -> str:
+    global last_iso
+    cached = last_iso
+    if cached[0] != epoch:
+        cached = last_iso = (epoch, time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(epoch)))
+    return cached[1]
+
+# Storage Protocol 
+class Storage(Protocol):
+    def locate(self, key: str, data: bytes) -> str: ...  # where data stored under key will live
+    def put(self, locator: str, data: bytes) -> str: ...  # locator comes from locate()
+    def get(self, locator: str) -> bytes | memoryview: ...  # any buffer the encoder can read
+
+class AsyncStorage(Protocol):
+    def locate(self, key: str, data: bytes) -> str: ...
+    async def put(self, locator: str, data: bytes) -> str: ...
+    async def get(self, locator: str) -> bytes | memoryview: ...
+
+# Local FS 
+class LocalFS(Storage):
+    def __init__(self, base: SysPath):
+        self.base = base
+        self.base.mkdir(parents=True, exist_ok=True)
+    def locate(self, key: str, data: bytes) -> str:
+        return str(safe_relpath(key)).replace("\\", "/")
+    def put(self, locator: str, data: bytes) -> str:
+        rel = safe_relpath(locator)
+        path = self.base / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(path.suffix + ".part")
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)  # atomic
+        return str(rel).replace("\\", "/")
+    def path(self, locator: str) -> SysPath:
+        path = self.base / safe_relpath(locator)
+        if not path.exists():
+            raise FileNotFoundError(locator)
+        return path
+    def get(self, locator: str) -> memoryview:
+        # read straight into one buffer sized from the file, no intermediate bytes
+        with open(self.path(locator), "rb", buffering=0) as f:
+            buf = bytearray(os.fstat(f.fileno()).st_size)
+            n = f.readinto(buf)
+        return memoryview(buf)[:n]
+
+LOCAL = LocalFS(LOCAL_STORAGE_DIR)
+
+# Database
+class DBTable(Storage):
+    def __init__(self, db_factory):
+        self.db_factory = db_factory
+    def locate(self, key: str, data: bytes) -> str:
+        # content address: ids with identical bytes share one stored row
+        return hashlib.sha256(data).hexdigest()
+    def put(self, locator: str, data: bytes) -> str:
+        with self.db_factory() as db:
+            db.execute(sqlite_insert(BlobContent).values(hash=locator, data=data).on_conflict_do_nothing())
+            db.commit()
+        return locator
+    def get(self, locator: str) -> memoryview:
+        with self.db_factory() as db:
+            row = db.get(BlobContent, locator)
+            if not row:
+                raise FileNotFoundError(locator)
+            return memoryview(row.data)  # no copy of the blob
+
+DBBACK = DBTable(SessionLocal)
+
+# S3
+class S3(AsyncStorage):
+    def __init__(self, endpoint: str, region: str, bucket: str):
+        self.endpoint = endpoint.rstrip("/")
+        self.region = region
+        self.bucket = bucket
+        self.session: Optional[aiohttp.ClientSession] = None  # opened on app startup
+
+    def locate(self, key: str, data: bytes) -> str:
+        return "/".join(safe_relpath(key).parts)
+
+    def _url(self, object_key: str) -> str:
+        host = f"{self.bucket}.s3.{self.region}.amazonaws.com"
+        return f"https://{host}/{object_key}"
+
+    async def put(self, locator: str, data: bytes) -> str:
+        url = self._url(locator)
+        async with self.session.put(url, data=data) as r:
+            if r.status not in (200, 201):
+                raise RuntimeError(f"S3 PUT failed: {r.status} {await r.text()}")
+        return locator
+
+    async def get(self, locator: str) -> memoryview:
+        url = self._url(locator)
+        async with self.session.get(url) as r:
+            if r.status != 200:
+                raise FileNotFoundError(f"S3 GET failed: {r.status} {await r.text()}")
+            # fill one preallocated buffer instead of joining chunks with r.read()
+            buf = bytearray(r.content_length or 0)
+            off = 0
+            async for chunk in r.content.iter_chunked(S3_CHUNK_SIZE):
+                end = off + len(chunk)
+                buf[off:end] = chunk
+                off = end
+        return memoryview(buf)[:off]
+
+S3BACK = S3(S3_ENDPOINT, S3_REGION, S3_BUCKET)
+
+# Blob cache: base64 payloads of hot local/db blobs, so hits skip both the read and the encode
+blob_cache: LRUCache = LRUCache(maxsize=BLOB_CACHE_BYTES, getsizeof=len)
+blob_cache_lock = threading.Lock()
+
+def get_encoded(backend: str, store: Storage, locator: str) -> str:
+    key = (backend, locator)
+    with blob_cache_lock:
+        data = blob_cache.get(key)
+    if data is None:
+        data = b64encode_as_string(store.get(locator))
+        if len(data) <= BLOB_CACHE_ITEM_LIMIT:
+            with blob_cache_lock:
+                blob_cache[key] = data
+    return data
+
+def forget_encoded(backend: str, locator: str) -> None:
+    with blob_cache_lock:
+        blob_cache.pop((backend, locator), None)
+
+# FastAPI 
+app = FastAPI(title="Simple Blob Store (local, db, s3 unsigned)", default_response_class=ORJSONResponse)
+app.add_middleware(BearerAuth)
+
+@app.on_event("startup")
+async def open_s3_session():
+    # one pooled client for the whole process, shared by every S3 request
+    app.state.s3_session = S3BACK.session = aiohttp.ClientSession()
+
+@app.on_event("shutdown")
+async def close_s3_session():
+    await app.state.s3_session.close()
+
+# Local
+@app.post("/v1/local/blobs", response_model=BlobOut)
+def store_local(body: BlobIn, db: Session = Depends(get_db)):
+    try:
+        raw = b64decode(body.data.encode("ascii"), validate=True)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid Base64 'data'")
+    meta = BlobMeta(id=body.id, backend="local", locator=LOCAL.locate(body.id, raw), size=len(raw), created_at=int(time.time()))
+    reserve_meta(db, meta)
+    try:
+        LOCAL.put(meta.locator, raw)
+    except Exception as e:
+        release_meta(db, meta)
+        raise HTTPException(status_code=502, detail=f"Backend error: {e}")
+    forget_encoded("local", meta.locator)  # locators can be shared, drop any stale payload
+    return BlobOut(id=body.id, data=body.data, size=len(raw), created_at=epoch_iso(meta.created_at))
+
+@app.get("/v1/local/blobs/{id:path}", response_model=BlobOut)
+def get_local(id: str, db: Session = Depends(get_db)):
+    meta = find_meta(db, "local", id)
+    if not meta:
+        raise HTTPException(status_code=404, detail="Unknown id")
+    try:
+        data = get_encoded("local", LOCAL, meta.locator)
+    except FileNotFoundError:
+        raise HTTPException(status_code=502, detail="Object missing in backend")
+    return BlobOut(id=id, data=data, size=meta.size, created_at=epoch_iso(meta.created_at))
+
+@app.get("/v1/local/raw/{id:path}")
+def get_local_raw(id: str, db: Session = Depends(get_db)):
+    # unencoded bytes; FileResponse hands the file to the socket (sendfile where available)
+    meta = find_meta(db, "local", id)
+    if not meta:
+        raise HTTPException(status_code=404, detail="Unknown id")
+    try:
+        path = LOCAL.path(meta.locator)
+    except FileNotFoundError:
+        raise HTTPException(status_code=502, detail="Object missing in backend")
+    return FileResponse(path, media_type="application/octet-stream")
+
+# DB
+@app.post("/v1/db/blobs", response_model=BlobOut)
+def store_db(body: BlobIn, db: Session = Depends(get_db)):
+    try:
+        raw = b64decode(body.data.encode("ascii"), validate=True)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid Base64 'data'")
+    meta = BlobMeta(id=body.id, backend="db", locator=DBBACK.locate(body.id, raw), size=len(raw), created_at=int(time.time()))
+    reserve_meta(db, meta)
+    try:
+        DBBACK.put(meta.locator, raw)
+    except Exception as e:
+        release_meta(db, meta)
+        raise HTTPException(status_code=502, detail=f"Backend error: {e}")
+    forget_encoded("db", meta.locator)  # locators can be shared, drop any stale payload
+    return BlobOut(id=body.id, data=body.data, size=len(raw), created_at=epoch_iso(meta.created_at))
+
+@app.get("/v1/db/blobs/{id:path}", response_model=BlobOut)
+def get_db_blob(id: str, db: Session = Depends(get_db)):
+    meta = find_meta(db, "db", id)
+    if not meta:
+        raise HTTPException(status_code=404, detail="Unknown id")
+    try:
+        data = get_encoded("db", DBBACK, meta.locator)
+    except FileNotFoundError:
+        raise HTTPException(status_code=502, detail="Object missing in backend")
+    return BlobOut(id=id, data=data, size=meta.size, created_at=epoch_iso(meta.created_at))
+
+# S3
+@app.post("/v1/s3/blobs", response_model=BlobOut)
+async def store_s3(body: BlobIn, db: Session = Depends(get_db)):
+    try:
+        raw = await run_in_threadpool(b64decode, body.data.encode("ascii"), validate=True)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid Base64 'data'")
+    meta = BlobMeta(id=body.id, backend="s3", locator=S3BACK.locate(body.id, raw), size=len(raw), created_at=int(time.time()))
+    await run_in_threadpool(reserve_meta, db, meta)
+    try:
+        await S3BACK.put(meta.locator, raw)
+    except Exception as e:
+        await run_in_threadpool(release_meta, db, meta)
+        raise HTTPException(status_code=502, detail=f"S3 error: {e}")
+    return BlobOut(id=body.id, data=body.data, size=len(raw), created_at=epoch_iso(meta.created_at))
+
+@app.get("/v1/s3/blobs/{id:path}", response_model=BlobOut)
+async def get_s3_blob(id: str, db: Session = Depends(get_db)):
+    meta = await run_in_threadpool(find_meta, db, "s3", id)
+    if not meta:
+        raise HTTPException(status_code=404, detail="Unknown id")
+    try:
+        raw = await S3BACK.get(meta.locator)
+    except FileNotFoundError:
+        raise HTTPException(status_code=502, detail="Object missing in backend")
+    data = await run_in_threadpool(b64encode_as_string, raw)  # keep the codec off the event loop
+    return BlobOut(id=id, data=data, size=meta.size, created_at=epoch_iso(meta.created_at))
+
+# load balancers poll this constantly: serve pre-serialized JSON, refreshed at most once per HEALTH_TTL
+health_body: tuple[float, bytes] = (float("-inf"), b"")
+
+@app.get("/health")
+def health():
+    global health_body
+    built_at, body = health_body
+    now = time.monotonic()
+    if now - built_at >= HEALTH_TTL:
+        with SessionLocal() as db:
+            blobs = {r.backend: {"count": r.count, "bytes": r.total_bytes} for r in db.query(BlobSummary)}
+        body = orjson.dumps({"ok": True, "backends": ["local", "db", "s3_unsigned"], "bucket": S3_BUCKET, "blobs": blobs})
+        health_body = (now, body)
+    return Response(content=body, media_type="application/json")
\ No newline at end of file